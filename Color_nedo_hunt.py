@@ -5,13 +5,12 @@
 
 import tkinter as tk
 from tkinter import ttk, colorchooser, messagebox
-from PIL import ImageColor
 import numpy as np
 import re
 import colorsys
-from typing import List, Tuple, Optional
-from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 
@@ -27,11 +26,14 @@ class RecolorMode(Enum):
 
 
 @dataclass
-class ColorResult:
-    """Результат обработки цвета"""
-    original: str
-    new_color: str
-    luminance: float
+class ColorResults:
+    """Результаты обработки палитры, хранимые по столбцам"""
+    originals: List[str]
+    new_colors: List[str]
+    luminances: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.originals)
 
 
 # ============================================================================
@@ -46,31 +48,102 @@ class ColorUtility:
         'р': 'p', 'т': 't', 'х': 'x', 'у': 'y', 'ё': 'e', 'ъ': '', 'ь': '',
         'ы': 'y', 'э': 'e', 'ю': 'yu', 'я': 'ya'
     }
+    CYRILLIC_TRANSLATION = str.maketrans(CYRILLIC_TO_LATIN)
     
-    @staticmethod
-    def relative_luminance(rgb: Tuple[int, int, int]) -> float:
+    NON_HEX_PATTERN = re.compile(r'[^0-9a-f#]')
+    CANONICAL_HEX_PATTERN = re.compile(r'#[0-9a-f]{6}')
+    
+    # Смещения оттенка для каналов R, G, B при переводе из HLS
+    HUE_OFFSETS = np.array([1.0 / 3.0, 0.0, -1.0 / 3.0])
+    
+    # Двузначные HEX-представления всех значений канала 0-255
+    HEX_BYTES = tuple(f'{i:02x}' for i in range(256))
+    
+    # Линеаризованные значения sRGB для всех 256 возможных значений канала
+    SRGB_LINEAR = np.array([
+        c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+        for c in (i / 255.0 for i in range(256))
+    ])
+    
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def relative_luminance(cls, rgb: Tuple[int, int, int]) -> float:
         """Вычисляет относительную яркость цвета"""
-        def adjust(channel: float) -> float:
-            return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
-        
-        r, g, b = [x / 255.0 for x in rgb]
-        r, g, b = adjust(r), adjust(g), adjust(b)
-        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+        r, g, b = rgb
+        lut = cls.SRGB_LINEAR
+        return float(0.2126 * lut[r] + 0.7152 * lut[g] + 0.0722 * lut[b])
+    
+    @classmethod
+    def relative_luminance_array(cls, rgb: np.ndarray) -> np.ndarray:
+        """Вычисляет относительную яркость для массива цветов (N, 3) в диапазоне 0-255"""
+        # Поэлементная сумма в том же порядке, что и в relative_luminance: результат
+        # не зависит от размера массива, в отличие от матричного умножения
+        lut = cls.SRGB_LINEAR
+        return 0.2126 * lut[rgb[:, 0]] + 0.7152 * lut[rgb[:, 1]] + 0.0722 * lut[rgb[:, 2]]
+    
+    @staticmethod
+    def rgb_to_hls_array(rgb: np.ndarray) -> np.ndarray:
+        """Векторный аналог colorsys.rgb_to_hls для массива (N, 3) в диапазоне 0-1"""
+        # Индекс максимального канала находится одним проходом; при равенстве
+        # argmax выбирает первый канал — тот же порядок r, g, b, что и в colorsys
+        max_idx = rgb.argmax(axis=1)
+        maxc = np.take_along_axis(rgb, max_idx[:, None], axis=1)[:, 0]
+        minc = rgb.min(axis=1)
+        sumc = maxc + minc
+        rangec = maxc - minc
+        l = sumc / 2.0
+        
+        # Для ахроматических цветов (rangec == 0) оттенок и насыщенность равны нулю
+        chromatic = rangec > 0
+        safe_range = np.where(chromatic, rangec, 1.0)
+        s = np.where(l <= 0.5,
+                     rangec / np.where(chromatic, sumc, 1.0),
+                     rangec / np.where(chromatic, 2.0 - maxc - minc, 1.0))
+        
+        rc, gc, bc = ((maxc[:, None] - rgb) / safe_range[:, None]).T
+        h = np.choose(max_idx, (bc - gc, 2.0 + rc - bc, 4.0 + gc - rc))
+        h = (h / 6.0) % 1.0
+        
+        h = np.where(chromatic, h, 0.0)
+        s = np.where(chromatic, s, 0.0)
+        return np.column_stack((h, l, s))
     
     @classmethod
+    def hls_to_rgb_array(cls, hls: np.ndarray) -> np.ndarray:
+        """Векторный аналог colorsys.hls_to_rgb для массива (N, 3)"""
+        # Столбцы (N, 1), чтобы все три канала считались одним проходом (N, 3)
+        h, l, s = hls[:, 0:1], hls[:, 1:2], hls[:, 2:3]
+        m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+        m1 = 2.0 * l - m2
+        delta = m2 - m1
+        
+        hue = (h + cls.HUE_OFFSETS) % 1.0
+        rgb = np.select(
+            [hue < 1.0 / 6.0, hue < 0.5, hue < 2.0 / 3.0],
+            [m1 + delta * hue * 6.0, m2, m1 + delta * (2.0 / 3.0 - hue) * 6.0],
+            m1
+        )
+        # Ахроматические цвета (s == 0) — оттенки серого
+        return np.where(s == 0.0, l, rgb)
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
     def normalize_color(cls, color: str) -> str:
         """Нормализует строку цвета"""
         if not color:
             return color
         
+        # Уже нормализованный цвет (#rrggbb) возвращаем без обработки
+        if cls.CANONICAL_HEX_PATTERN.fullmatch(color):
+            return color
+        
         color = color.strip().lower()
         
         # Заменяем кириллицу на латиницу
-        for cyr, lat in cls.CYRILLIC_TO_LATIN.items():
-            color = color.replace(cyr, lat)
+        color = color.translate(cls.CYRILLIC_TRANSLATION)
         
         # Удаляем недопустимые символы
-        color = re.sub(r'[^0-9a-f#]', '', color)
+        color = cls.NON_HEX_PATTERN.sub('', color)
         
         # Обработка различных форматов
         if color.startswith('#'):
@@ -86,26 +159,45 @@ class ColorUtility:
         
         return color
     
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def try_normalize(cls, color: str) -> Optional[str]:
+        """Нормализует цвет к виду #rrggbb, возвращает None для некорректного цвета"""
+        normalized = cls.normalize_color(color)
+        if normalized and cls.CANONICAL_HEX_PATTERN.fullmatch(normalized):
+            return normalized
+        return None
+    
     @classmethod
     def is_valid_color(cls, color: str) -> bool:
         """Проверяет валидность цвета"""
-        if not color or not color.strip():
-            return False
-        
-        normalized = cls.normalize_color(color)
-        if not normalized:
-            return False
-        
-        try:
-            ImageColor.getrgb(normalized)
-            return True
-        except ValueError:
-            return False
+        return cls.try_normalize(color) is not None
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+        """Преобразует нормализованный HEX (#rrggbb) в RGB"""
+        r, g, b = bytes.fromhex(hex_color[1:])
+        return r, g, b
     
     @staticmethod
-    def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
+    def hex_to_rgb_array(hex_colors: List[str]) -> np.ndarray:
+        """Преобразует список нормализованных HEX (#rrggbb) в массив RGB (N, 3)"""
+        packed = bytes.fromhex(''.join(c[1:] for c in hex_colors))
+        return np.frombuffer(packed, dtype=np.uint8).reshape(-1, 3)
+    
+    @classmethod
+    def rgb_to_hex(cls, rgb: Tuple[int, int, int]) -> str:
         """Преобразует RGB в HEX"""
-        return "#{:02x}{:02x}{:02x}".format(*rgb)
+        r, g, b = rgb
+        hex_bytes = cls.HEX_BYTES
+        return '#' + hex_bytes[r] + hex_bytes[g] + hex_bytes[b]
+    
+    @staticmethod
+    def rgb_array_to_hex(rgb: np.ndarray) -> List[str]:
+        """Преобразует массив RGB (N, 3) в список HEX"""
+        packed = np.asarray(rgb, dtype=np.uint8).tobytes().hex()
+        return ['#' + packed[i:i + 6] for i in range(0, len(packed), 6)]
     
     @staticmethod
     def get_complementary_color(hex_color: str) -> str:
@@ -120,102 +212,99 @@ class ColorUtility:
 # СТРАТЕГИИ ПЕРЕКРАСКИ
 # ============================================================================
 
-class RecolorStrategy(ABC):
-    """Базовый класс для стратегий перекраски"""
-    
-    @abstractmethod
-    def recolor(self, original_hls: Tuple[float, float, float],
-                target_hls: Tuple[float, float, float],
-                luminance_ratio: float,
-                intensity: float) -> Tuple[float, float, float]:
-        """Выполняет перекраску цвета"""
-        pass
+# Сигнатура функции перекраски: (исходные HLS (N, 3), целевой HLS, относительные яркости,
+# интенсивность, яркости исходных цветов) -> новые HLS (N, 3)
+RecolorFunction = Callable[[np.ndarray, Tuple[float, float, float], np.ndarray, float,
+                            np.ndarray], np.ndarray]
 
 
-class KeepHueStrategy(RecolorStrategy):
+def keep_hue_recolor(original_hls: np.ndarray,
+                     target_hls: Tuple[float, float, float],
+                     luminance_ratio: np.ndarray,
+                     intensity: float,
+                     orig_luminance: np.ndarray) -> np.ndarray:
     """Стратегия с сохранением исходного оттенка"""
+    orig_h, orig_l, orig_s = original_hls.T
+    target_h, target_l, target_s = target_hls
     
-    def recolor(self, original_hls: Tuple[float, float, float],
-                target_hls: Tuple[float, float, float],
-                luminance_ratio: float,
-                intensity: float) -> Tuple[float, float, float]:
-        orig_h, orig_l, orig_s = original_hls
-        target_h, target_l, target_s = target_hls
-        
-        new_h = orig_h
-        new_l = 0.2 + 0.7 * luminance_ratio
-        new_s = target_s * 0.7 + orig_s * 0.3
-        
-        # Применяем интенсивность
-        if intensity < 1.0:
-            new_h = orig_h * (1 - intensity) + new_h * intensity
-            new_s = orig_s * (1 - intensity) + new_s * intensity
-            new_l = orig_l * (1 - intensity) + new_l * intensity
-        
-        return new_h, new_l, new_s
+    new_h = orig_h
+    new_l = 0.2 + 0.7 * luminance_ratio
+    new_s = target_s * 0.7 + orig_s * 0.3
+    
+    # Применяем интенсивность (оттенок не меняется, смешивать его не нужно)
+    if intensity < 1.0:
+        inv_intensity = 1 - intensity
+        new_s = orig_s * inv_intensity + new_s * intensity
+        new_l = orig_l * inv_intensity + new_l * intensity
+    
+    return np.column_stack((new_h, new_l, new_s))
 
 
-class FullRecolorStrategy(RecolorStrategy):
+def full_recolor(original_hls: np.ndarray,
+                 target_hls: Tuple[float, float, float],
+                 luminance_ratio: np.ndarray,
+                 intensity: float,
+                 orig_luminance: np.ndarray) -> np.ndarray:
     """Стратегия полной перекраски"""
+    orig_h, orig_l, orig_s = original_hls.T
+    target_h, target_l, target_s = target_hls
     
-    def recolor(self, original_hls: Tuple[float, float, float],
-                target_hls: Tuple[float, float, float],
-                luminance_ratio: float,
-                intensity: float) -> Tuple[float, float, float]:
-        orig_h, orig_l, orig_s = original_hls
-        target_h, target_l, target_s = target_hls
-        
-        new_h = target_h
-        
-        # Корректируем яркость в зависимости от палитры
-        max_orig_lum = luminance_ratio  # Используем как индикатор
-        if max_orig_lum > 0.7:
-            new_l = 0.5 + 0.4 * luminance_ratio
-        else:
-            new_l = 0.2 + 0.5 * luminance_ratio
-        
-        orig_lum = ColorUtility.relative_luminance(
-            tuple(int(c * 255) for c in colorsys.hls_to_rgb(orig_h, orig_l, orig_s))
-        )
-        new_s = target_s * (0.8 + 0.2 * (1 - orig_lum))
-        
-        # Применяем интенсивность
-        if intensity < 1.0:
-            new_h = orig_h * (1 - intensity) + new_h * intensity
-            new_s = orig_s * (1 - intensity) + new_s * intensity
-            new_l = orig_l * (1 - intensity) + new_l * intensity
-        
-        return new_h, new_l, new_s
+    new_h = np.full_like(orig_h, target_h)
+    
+    # Корректируем яркость в зависимости от палитры
+    max_orig_lum = luminance_ratio  # Используем как индикатор
+    new_l = np.where(max_orig_lum > 0.7,
+                     0.5 + 0.4 * luminance_ratio,
+                     0.2 + 0.5 * luminance_ratio)
+    
+    new_s = target_s * (0.8 + 0.2 * (1 - orig_luminance))
+    
+    # Применяем интенсивность
+    if intensity < 1.0:
+        inv_intensity = 1 - intensity
+        new_h = orig_h * inv_intensity + new_h * intensity
+        new_s = orig_s * inv_intensity + new_s * intensity
+        new_l = orig_l * inv_intensity + new_l * intensity
+    
+    return np.column_stack((new_h, new_l, new_s))
 
 
-class MixedStrategy(RecolorStrategy):
+def mixed_recolor(original_hls: np.ndarray,
+                  target_hls: Tuple[float, float, float],
+                  luminance_ratio: np.ndarray,
+                  intensity: float,
+                  orig_luminance: np.ndarray) -> np.ndarray:
     """Смешанная стратегия"""
+    orig_h, orig_l, orig_s = original_hls.T
+    target_h, target_l, target_s = target_hls
     
-    def recolor(self, original_hls: Tuple[float, float, float],
-                target_hls: Tuple[float, float, float],
-                luminance_ratio: float,
-                intensity: float) -> Tuple[float, float, float]:
-        orig_h, orig_l, orig_s = original_hls
-        target_h, target_l, target_s = target_hls
-        
-        new_h = orig_h * (1 - intensity) + target_h * intensity
-        new_l = orig_l * (1 - intensity) + (0.3 + 0.6 * luminance_ratio) * intensity
-        new_s = orig_s * (1 - intensity) + target_s * intensity
-        
-        return new_h, new_l, new_s
+    # При полной интенсивности смешивание с исходным цветом не нужно
+    if intensity >= 1.0:
+        new_h = np.full_like(orig_h, target_h)
+        new_l = 0.3 + 0.6 * luminance_ratio
+        new_s = np.full_like(orig_s, target_s)
+        return np.column_stack((new_h, new_l, new_s))
+    
+    # Скалярные множители вычисляются один раз на палитру
+    inv_intensity = 1 - intensity
+    new_h = orig_h * inv_intensity + target_h * intensity
+    new_l = orig_l * inv_intensity + (0.3 + 0.6 * luminance_ratio) * intensity
+    new_s = orig_s * inv_intensity + target_s * intensity
+    
+    return np.column_stack((new_h, new_l, new_s))
 
 
 class StrategyFactory:
     """Фабрика для создания стратегий перекраски"""
     
     _strategies = {
-        RecolorMode.KEEP_HUE: KeepHueStrategy(),
-        RecolorMode.FULL_RECOLOR: FullRecolorStrategy(),
-        RecolorMode.MIXED: MixedStrategy()
+        RecolorMode.KEEP_HUE: keep_hue_recolor,
+        RecolorMode.FULL_RECOLOR: full_recolor,
+        RecolorMode.MIXED: mixed_recolor
     }
     
     @classmethod
-    def get_strategy(cls, mode: RecolorMode) -> RecolorStrategy:
+    def get_strategy(cls, mode: RecolorMode) -> RecolorFunction:
         """Возвращает стратегию по режиму"""
         return cls._strategies.get(mode, cls._strategies[RecolorMode.FULL_RECOLOR])
 
@@ -227,68 +316,101 @@ class StrategyFactory:
 class ColorRecolorService:
     """Сервис для перекраски палитр цветов"""
     
-    def __init__(self):
-        self.color_util = ColorUtility()
+    # Допустимые границы HLS-компонент результата (H, L, S)
+    HLS_MIN = np.array([0.0, 0.1, 0.1])
+    HLS_MAX = np.array([1.0, 0.95, 1.0])
     
     def recolor_palette(self, original_colors: List[str], 
                        target_base: str, 
                        intensity: float, 
-                       mode: RecolorMode) -> List[ColorResult]:
+                       mode: RecolorMode) -> ColorResults:
         """Перекрашивает палитру цветов"""
-        
-        # Валидация и нормализация входных цветов
-        valid_colors = [
-            self.color_util.normalize_color(c) 
-            for c in original_colors 
-            if self.color_util.is_valid_color(c)
-        ]
+        return self.recolor_palettes([original_colors], target_base, intensity, mode)[0]
+    
+    def recolor_palettes(self, palettes: List[List[str]],
+                         target_base: str,
+                         intensity: float,
+                         mode: RecolorMode) -> List[ColorResults]:
+        """Перекрашивает несколько палитр одним проходом по общему массиву цветов"""
+        
+        # Целевой цвет нормализуется так же, как входные (#abc, имена цветов)
+        normalized_target = ColorUtility.try_normalize(target_base)
+        if normalized_target is None:
+            raise ValueError(f"Некорректный базовый цвет: {target_base!r}")
+        
+        # Валидация и нормализация входных цветов за один вызов на цвет
+        valid_palettes = [[c for c in map(ColorUtility.try_normalize, colors) if c is not None]
+                          for colors in palettes]
+        valid_colors = [c for colors in valid_palettes for c in colors]
         
         if not valid_colors:
-            return []
+            return [ColorResults([], [], np.empty(0)) for _ in palettes]
         
         # Получаем целевой цвет
-        target_rgb = np.array(ImageColor.getrgb(target_base)) / 255.0
-        target_hls = colorsys.rgb_to_hls(*target_rgb)
+        target_r, target_g, target_b = ColorUtility.hex_to_rgb(normalized_target)
+        target_hls = colorsys.rgb_to_hls(target_r / 255.0, target_g / 255.0, target_b / 255.0)
+        
+        # Все палитры обрабатываются одним массивом (N, 3)
+        rgb = ColorUtility.hex_to_rgb_array(valid_colors)
         
         # Вычисляем яркости исходных цветов
-        luminances = [
-            self.color_util.relative_luminance(ImageColor.getrgb(c))
-            for c in valid_colors
-        ]
+        luminances = ColorUtility.relative_luminance_array(rgb)
+        
+        # Диапазон яркости нормируется отдельно для каждой палитры
+        bounds = np.cumsum([len(colors) for colors in valid_palettes])[:-1]
+        lum_ratios = np.empty_like(luminances)
+        for lum, ratios in zip(np.split(luminances, bounds), np.split(lum_ratios, bounds)):
+            if not lum.size:
+                continue
+            
+            # Одинаковая яркость всех цветов дает нулевой диапазон — заменяем на 1.0
+            min_lum = float(lum.min())
+            lum_range = float(lum.max()) - min_lum or 1.0
+            
+            # Одно деление на всю палитру вместо деления для каждого цвета
+            np.subtract(lum, min_lum, out=ratios)
+            ratios *= 1.0 / lum_range
         
-        min_lum, max_lum = min(luminances), max(luminances)
-        lum_range = max_lum - min_lum if max_lum != min_lum else 1.0
+        new_rgb = self.recolor_rgb_array(rgb, target_hls, lum_ratios, intensity, mode, luminances)
+        new_luminances = ColorUtility.relative_luminance_array(new_rgb)
+        new_colors = ColorUtility.rgb_array_to_hex(new_rgb)
         
-        # Получаем стратегию перекраски
+        # Разбиваем общий результат обратно по палитрам
+        results = []
+        start = 0
+        for colors in valid_palettes:
+            end = start + len(colors)
+            results.append(ColorResults(colors, new_colors[start:end], new_luminances[start:end]))
+            start = end
+        return results
+    
+    def recolor_rgb_array(self, rgb: np.ndarray,
+                          target_hls: Tuple[float, float, float],
+                          luminance_ratios: np.ndarray,
+                          intensity: float,
+                          mode: RecolorMode,
+                          luminances: Optional[np.ndarray] = None) -> np.ndarray:
+        """Перекрашивает массив цветов (N, 3) 0-255 и возвращает новый массив (N, 3) uint8"""
         strategy = StrategyFactory.get_strategy(mode)
         
-        results = []
-        for color, orig_lum in zip(valid_colors, luminances):
-            # Получаем исходный цвет в HLS
-            rgb = np.array(ImageColor.getrgb(color)) / 255.0
-            orig_hls = colorsys.rgb_to_hls(*rgb)
-            
-            # Вычисляем относительную яркость
-            lum_ratio = (orig_lum - min_lum) / lum_range if lum_range > 0 else 0.5
-            
-            # Применяем стратегию
-            new_h, new_l, new_s = strategy.recolor(orig_hls, target_hls, lum_ratio, intensity)
-            
-            # Ограничиваем значения
-            new_h = np.clip(new_h, 0.0, 1.0)
-            new_s = np.clip(new_s, 0.1, 1.0)
-            new_l = np.clip(new_l, 0.1, 0.95)
-            
-            # Конвертируем обратно в RGB
-            new_rgb = colorsys.hls_to_rgb(new_h, new_l, new_s)
-            new_rgb_int = tuple(int(round(x * 255)) for x in new_rgb)
-            
-            new_color_hex = self.color_util.rgb_to_hex(new_rgb_int)
-            new_luminance = self.color_util.relative_luminance(new_rgb_int)
-            
-            results.append(ColorResult(color, new_color_hex, new_luminance))
+        if luminances is None:
+            luminances = ColorUtility.relative_luminance_array(rgb)
         
-        return results
+        orig_hls = ColorUtility.rgb_to_hls_array(rgb / 255.0)
+        
+        # При нулевой интенсивности любая стратегия возвращает исходные HLS
+        if intensity <= 0.0:
+            new_hls = orig_hls
+        else:
+            new_hls = strategy(orig_hls, target_hls, luminance_ratios, intensity, luminances)
+        
+        # Ограничиваем значения
+        np.clip(new_hls, self.HLS_MIN, self.HLS_MAX, out=new_hls)
+        
+        # Конвертируем обратно в RGB
+        new_rgb = ColorUtility.hls_to_rgb_array(new_hls)
+        new_rgb *= 255
+        return np.rint(new_rgb, out=new_rgb).astype(np.uint8)
 
 
 # ============================================================================
@@ -298,26 +420,48 @@ class ColorRecolorService:
 class ContextMenuMixin:
     """Миксин для добавления контекстного меню"""
     
-    @staticmethod
-    def add_context_menu(widget):
+    # Одно меню на все виджеты окна; команды применяются к виджету, по которому кликнули
+    _menu: Optional[tk.Menu] = None
+    _target: Optional[tk.Widget] = None
+    
+    @classmethod
+    def add_context_menu(cls, widget):
         """Добавляет контекстное меню к виджету"""
-        menu = tk.Menu(widget, tearoff=0)
-        menu.add_command(label="Копировать", command=lambda: widget.event_generate('<<Copy>>'))
-        menu.add_command(label="Вставить", command=lambda: widget.event_generate('<<Paste>>'))
-        menu.add_command(label="Вырезать", command=lambda: widget.event_generate('<<Cut>>'))
-        menu.add_separator()
-        menu.add_command(label="Выделить все", 
-                        command=lambda: widget.select_range(0, tk.END) if hasattr(widget, 'select_range') 
-                        else widget.tag_add(tk.SEL, "1.0", tk.END))
-        
-        def show_menu(event):
-            try:
-                menu.tk_popup(event.x_root, event.y_root)
-            finally:
-                menu.grab_release()
+        master = widget.winfo_toplevel()
+        if cls._menu is None or cls._menu.master is not master:
+            cls._menu = cls._create_menu(master)
         
-        widget.bind("<Button-3>", show_menu)
+        widget.bind("<Button-3>", cls._show_menu)
+        return cls._menu
+    
+    @classmethod
+    def _create_menu(cls, master) -> tk.Menu:
+        """Создает общее контекстное меню"""
+        menu = tk.Menu(master, tearoff=0)
+        menu.add_command(label="Копировать", command=lambda: cls._target.event_generate('<<Copy>>'))
+        menu.add_command(label="Вставить", command=lambda: cls._target.event_generate('<<Paste>>'))
+        menu.add_command(label="Вырезать", command=lambda: cls._target.event_generate('<<Cut>>'))
+        menu.add_separator()
+        menu.add_command(label="Выделить все", command=cls._select_all)
         return menu
+    
+    @classmethod
+    def _select_all(cls):
+        """Выделяет весь текст виджета, для которого открыто меню"""
+        widget = cls._target
+        if hasattr(widget, 'select_range'):
+            widget.select_range(0, tk.END)
+        else:
+            widget.tag_add(tk.SEL, "1.0", tk.END)
+    
+    @classmethod
+    def _show_menu(cls, event):
+        """Показывает меню для виджета, по которому кликнули"""
+        cls._target = event.widget
+        try:
+            cls._menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            cls._menu.grab_release()
 
 
 class StyledFrame(tk.Frame):
@@ -337,6 +481,12 @@ class StyledFrame(tk.Frame):
 class ColorPaletteFrame(StyledFrame):
     """Художественная палитра цветов"""
     
+    # Максимальное количество цветов в колонке
+    MAX_COLORS = 10
+    
+    # Задержка обновления превью после последнего нажатия клавиши (мс)
+    PREVIEW_DEBOUNCE_MS = 120
+    
     def __init__(self, parent, title: str, icon: str = "🎨"):
         super().__init__(parent)
         
@@ -355,75 +505,148 @@ class ColorPaletteFrame(StyledFrame):
         
         self.entries: List[tk.Entry] = []
         self.previews: List[tk.Label] = []
+        
+        # Отложенные обновления превью: индекс -> параметры виджета
+        self._pending_previews: Dict[int, dict] = {}
+        self._flush_scheduled = False
+        
+        # Запланированные обновления превью при вводе: индекс -> id таймера
+        self._preview_jobs: Dict[int, str] = {}
+        
+        # Пул строк создается один раз, лишние строки просто скрываются
+        self._rows: List[StyledFrame] = []
+        self._entry_pool: List[tk.Entry] = []
+        self._preview_pool: List[tk.Label] = []
+        
+        # Последние примененные параметры каждого превью из пула
+        self._preview_state: List[dict] = []
+        for i in range(self.MAX_COLORS):
+            self._create_row(i)
+    
+    def _create_row(self, i: int):
+        """Создает строку ввода цвета и добавляет ее в пул"""
+        row_frame = StyledFrame(self.content_frame, bg='#ffffff')
+        
+        # Номер цвета
+        number_label = tk.Label(row_frame, text=f"{i+1}.", font=('Segoe UI', 10),
+                               bg='#ffffff', fg='#7f8c8d', width=3)
+        number_label.pack(side='left')
+        
+        # Превью цвета (больше и с тенью)
+        preview_frame = StyledFrame(row_frame, bg='#ffffff')
+        preview_frame.pack(side='left', padx=(0, 10))
+        
+        preview = tk.Label(preview_frame, width=6, height=1, 
+                         relief='ridge', borderwidth=2,
+                         bg='#ffffff', highlightbackground='#bdc3c7',
+                         cursor="hand2")
+        preview.pack()
+        preview.bind("<Button-1>", lambda e, idx=i: self._choose_color(idx))
+        
+        # Поле ввода с художественным стилем
+        entry_frame = StyledFrame(row_frame, bg='#ffffff')
+        entry_frame.pack(side='left', fill='x', expand=True)
+        
+        entry = tk.Entry(entry_frame, font=('Segoe UI', 10),
+                       relief='flat', bd=2, highlightthickness=1,
+                       highlightcolor='#3498db', highlightbackground='#bdc3c7',
+                       bg='#f8f9fa', fg='#2c3e50')
+        entry.pack(fill='x', ipady=3)
+        entry.bind('<KeyRelease>', lambda e, idx=i: self._schedule_preview(idx))
+        entry.bind('<FocusIn>', lambda e: entry.configure(highlightbackground='#3498db'))
+        entry.bind('<FocusOut>', lambda e: entry.configure(highlightbackground='#bdc3c7'))
+        
+        ContextMenuMixin.add_context_menu(entry)
+        
+        # Кнопка выбора цвета (иконка вместо текста)
+        btn = tk.Button(row_frame, text="🖌️", font=('Segoe UI', 10),
+                      width=3, relief='raised', bd=1,
+                      bg='#3498db', fg='white', activebackground='#2980b9',
+                      command=lambda idx=i: self._choose_color(idx))
+        btn.pack(side='right', padx=(5, 0))
+        
+        self._rows.append(row_frame)
+        self._entry_pool.append(entry)
+        self._preview_pool.append(preview)
+        self._preview_state.append({'bg': '#ffffff', 'highlightbackground': '#bdc3c7'})
     
     def create_color_inputs(self, count: int):
-        """Создает поля для ввода цветов"""
-        # Очищаем старые виджеты
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
-        self.entries.clear()
-        self.previews.clear()
-        
-        # Создаем сетку
-        for i in range(count):
-            row_frame = StyledFrame(self.content_frame, bg='#ffffff')
-            row_frame.pack(fill='x', pady=4, padx=10)
-            
-            # Номер цвета
-            number_label = tk.Label(row_frame, text=f"{i+1}.", font=('Segoe UI', 10),
-                                   bg='#ffffff', fg='#7f8c8d', width=3)
-            number_label.pack(side='left')
-            
-            # Превью цвета (больше и с тенью)
-            preview_frame = StyledFrame(row_frame, bg='#ffffff')
-            preview_frame.pack(side='left', padx=(0, 10))
-            
-            preview = tk.Label(preview_frame, width=6, height=1, 
-                             relief='ridge', borderwidth=2,
-                             bg='#ffffff', highlightbackground='#bdc3c7',
-                             cursor="hand2")
-            preview.pack()
-            preview.bind("<Button-1>", lambda e, idx=i: self._choose_color(idx))
-            self.previews.append(preview)
-            
-            # Поле ввода с художественным стилем
-            entry_frame = StyledFrame(row_frame, bg='#ffffff')
-            entry_frame.pack(side='left', fill='x', expand=True)
-            
-            entry = tk.Entry(entry_frame, font=('Segoe UI', 10),
-                           relief='flat', bd=2, highlightthickness=1,
-                           highlightcolor='#3498db', highlightbackground='#bdc3c7',
-                           bg='#f8f9fa', fg='#2c3e50')
-            entry.pack(fill='x', ipady=3)
-            entry.bind('<KeyRelease>', lambda e, idx=i: self._update_preview(idx))
-            entry.bind('<FocusIn>', lambda e: entry.configure(highlightbackground='#3498db'))
-            entry.bind('<FocusOut>', lambda e: entry.configure(highlightbackground='#bdc3c7'))
+        """Показывает пустые поля для ввода цветов в нужном количестве"""
+        # Отменяем отложенные обновления старых полей
+        for job in self._preview_jobs.values():
+            self.after_cancel(job)
+        self._preview_jobs.clear()
+        self._pending_previews.clear()
+        
+        # В спинбокс можно ввести и ноль, и отрицательное число
+        count = max(0, min(count, self.MAX_COLORS))
+        
+        for i, row_frame in enumerate(self._rows):
+            # Очищаем поле и превью
+            self._entry_pool[i].delete(0, tk.END)
+            self._apply_preview(i, bg='#ffffff', highlightbackground='#bdc3c7')
             
-            ContextMenuMixin.add_context_menu(entry)
-            self.entries.append(entry)
-            
-            # Кнопка выбора цвета (иконка вместо текста)
-            btn = tk.Button(row_frame, text="🖌️", font=('Segoe UI', 10),
-                          width=3, relief='raised', bd=1,
-                          bg='#3498db', fg='white', activebackground='#2980b9',
-                          command=lambda idx=i: self._choose_color(idx))
-            btn.pack(side='right', padx=(5, 0))
+            if i < count:
+                if not row_frame.winfo_manager():
+                    row_frame.pack(fill='x', pady=4, padx=10)
+            else:
+                row_frame.pack_forget()
+        
+        self.entries = self._entry_pool[:count]
+        self.previews = self._preview_pool[:count]
+    
+    def _schedule_preview(self, idx: int):
+        """Откладывает обновление превью до паузы в наборе текста"""
+        job = self._preview_jobs.pop(idx, None)
+        if job:
+            self.after_cancel(job)
+        self._preview_jobs[idx] = self.after(self.PREVIEW_DEBOUNCE_MS,
+                                             self._run_scheduled_preview, idx)
+    
+    def _run_scheduled_preview(self, idx: int):
+        """Выполняет запланированное обновление превью"""
+        self._preview_jobs.pop(idx, None)
+        self._update_preview(idx)
     
     def _update_preview(self, idx: int):
         """Обновляет превью цвета"""
         color = self.entries[idx].get().strip()
-        normalized = ColorUtility.normalize_color(color)
+        normalized = ColorUtility.try_normalize(color)
         
-        if ColorUtility.is_valid_color(normalized):
-            self.previews[idx].config(bg=normalized)
+        if normalized is not None:
             # Обновляем цвет рамки в зависимости от яркости
-            rgb = ImageColor.getrgb(normalized)
+            rgb = ColorUtility.hex_to_rgb(normalized)
             luminance = ColorUtility.relative_luminance(rgb)
             border_color = '#2c3e50' if luminance > 0.5 else '#ecf0f1'
-            self.previews[idx].config(highlightbackground=border_color)
+            self._queue_preview(idx, bg=normalized, highlightbackground=border_color)
         else:
-            self.previews[idx].config(bg='#ffffff', highlightbackground='#bdc3c7')
+            self._queue_preview(idx, bg='#ffffff', highlightbackground='#bdc3c7')
+    
+    def _queue_preview(self, idx: int, **options):
+        """Ставит обновление превью в очередь, чтобы применить все изменения за один проход"""
+        self._pending_previews.setdefault(idx, {}).update(options)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_previews)
+    
+    def _flush_previews(self):
+        """Применяет накопленные обновления превью"""
+        pending, self._pending_previews = self._pending_previews, {}
+        self._flush_scheduled = False
+        
+        for idx, options in pending.items():
+            if idx < len(self.previews):
+                self._apply_preview(idx, **options)
+        
+        self.content_frame.update_idletasks()
+    
+    def _apply_preview(self, idx: int, **options):
+        """Применяет к превью только изменившиеся параметры одним вызовом config"""
+        state = self._preview_state[idx]
+        changed = {key: value for key, value in options.items() if state.get(key) != value}
+        if changed:
+            self._preview_pool[idx].config(**changed)
+            state.update(changed)
     
     def _choose_color(self, idx: int):
         """Открывает диалог выбора цвета"""
@@ -432,11 +655,12 @@ class ColorPaletteFrame(StyledFrame):
         if color_code[1]:
             self.entries[idx].delete(0, tk.END)
             self.entries[idx].insert(0, color_code[1])
-            self.previews[idx].config(bg=color_code[1])
+            self._apply_preview(idx, bg=color_code[1])
     
     def get_colors(self) -> List[str]:
         """Возвращает список введенных цветов"""
-        return [entry.get().strip() for entry in self.entries if entry.get().strip()]
+        # Каждое поле читается один раз: get() — обращение к интерпретатору Tcl
+        return [color for color in (entry.get().strip() for entry in self.entries) if color]
     
     def set_colors(self, colors: List[str]):
         """Устанавливает цвета"""
@@ -447,16 +671,24 @@ class ColorPaletteFrame(StyledFrame):
                 self._update_preview(i)
     
     def update_preview_colors(self, colors: List[str]):
-        """Обновляет превью с новыми цветами"""
-        for i, color in enumerate(colors):
-            if i < len(self.previews):
-                self.previews[i].config(bg=color)
-                # Обновляем рамку
-                if ColorUtility.is_valid_color(color):
-                    rgb = ImageColor.getrgb(color)
-                    luminance = ColorUtility.relative_luminance(rgb)
-                    border_color = '#2c3e50' if luminance > 0.5 else '#ecf0f1'
-                    self.previews[i].config(highlightbackground=border_color)
+        """Обновляет превью с новыми цветами (нормализованными #rrggbb)"""
+        colors = colors[:len(self.previews)]
+        if not colors:
+            return
+        
+        # Рамки для всех превью вычисляются одним проходом по палитре
+        for i, (color, border_color) in enumerate(zip(colors, self._border_colors(colors))):
+            # Отложенное обновление из поля ввода не должно перетереть результат
+            job = self._preview_jobs.pop(i, None)
+            if job:
+                self.after_cancel(job)
+            self._queue_preview(i, bg=color, highlightbackground=border_color)
+    
+    @staticmethod
+    def _border_colors(colors: List[str]) -> List[str]:
+        """Подбирает цвет рамки превью по яркости для каждого цвета палитры"""
+        luminances = ColorUtility.relative_luminance_array(ColorUtility.hex_to_rgb_array(colors))
+        return np.where(luminances > 0.5, '#2c3e50', '#ecf0f1').tolist()
 
 
 # ============================================================================
@@ -466,6 +698,31 @@ class ColorPaletteFrame(StyledFrame):
 class ColorRecolorApp:
     """Главное приложение для перекраски цветов с художественным дизайном"""
     
+    # Минимальный интервал между обновлениями метки интенсивности (мс, ~30 Гц)
+    INTENSITY_LABEL_INTERVAL_MS = 33
+    
+    # Теги форматирования текста результатов: (имя, параметры tag_config)
+    TEXT_TAGS = (
+        ('header', {'font': ('Consolas', 12, 'bold'), 'foreground': '#3498db',
+                    'spacing1': 10, 'spacing3': 5}),
+        ('subheader', {'font': ('Consolas', 11, 'bold'), 'foreground': '#9b59b6',
+                       'spacing1': 8}),
+        ('bold', {'font': ('Consolas', 11, 'bold')}),
+        ('original', {'font': ('Consolas', 11), 'foreground': '#e74c3c'}),
+        ('new', {'font': ('Consolas', 11, 'bold'), 'foreground': '#27ae60'}),
+        ('arrow', {'font': ('Consolas', 11), 'foreground': '#f1c40f'}),
+        ('luminance', {'font': ('Consolas', 10), 'foreground': '#95a5a6'}),
+        ('summary', {'font': ('Consolas', 11, 'bold'), 'foreground': '#f1c40f',
+                     'spacing1': 10}),
+        ('separator', {'font': ('Consolas', 10), 'foreground': '#7f8c8d'}),
+        ('success', {'font': ('Consolas', 11, 'bold'), 'foreground': '#27ae60',
+                     'spacing1': 10}),
+        ('error', {'font': ('Consolas', 11, 'bold'), 'foreground': '#e74c3c'}),
+    )
+    
+    # Индикаторы яркости: индекс = (яркость >= 0.3) + (яркость > 0.7)
+    LUMINANCE_LABELS = ("🔅 Тёмный", "💡 Средний", "🔆 Светлый")
+    
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("🎨 Color Nedo Hunt - Мастерская цветовых трансформаций")
@@ -488,13 +745,23 @@ class ColorRecolorApp:
         self.color_count = tk.IntVar(value=6)
         self.intensity_var = tk.DoubleVar(value=1.0)
         self.mode_var = tk.StringVar(value=RecolorMode.FULL_RECOLOR.value)
+        self.base_color_var = tk.StringVar(value="#3498db")
+        
+        # Запланированное обновление метки интенсивности
+        self._intensity_label_job: Optional[str] = None
+        
+        # Запланированное обновление превью базового цвета
+        self._base_preview_job: Optional[str] = None
+        
+        # Количество полей, показанное в колонках сейчас
+        self._shown_color_count: Optional[int] = None
         
         # Создаем интерфейс
         self._create_ui()
         
-        # Инициализация
+        # Инициализация: пример загружается до первой отрисовки окна
         self.update_color_boxes()
-        self.root.after(100, self._load_example_data)
+        self._load_example_data()
     
     def _setup_styles(self):
         """Настраивает стили для виджетов"""
@@ -533,8 +800,20 @@ class ColorRecolorApp:
         main_container = StyledFrame(canvas)
         canvas.create_window((0, 0), window=main_container, anchor='nw')
 
+        last_size = None
+        
         def on_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+            nonlocal last_size
+            
+            # <Configure> приходит и без изменения размера — такие события пропускаем
+            size = (event.width, event.height)
+            if size == last_size:
+                return
+            last_size = size
+            
+            # Контейнер — единственный элемент холста в (0, 0), поэтому область
+            # прокрутки равна его размеру из события, без запроса canvas.bbox
+            canvas.configure(scrollregion=(0, 0) + size)
 
         main_container.bind("<Configure>", on_configure)
 
@@ -652,13 +931,13 @@ class ColorRecolorApp:
                 font=('Segoe UI', 10),
                 bg='#2c3e50', fg='#bdc3c7').pack(side='left', padx=(0, 10))
         
-        spinbox = tk.Spinbox(row1_frame, from_=1, to=10, width=8,
+        spinbox = tk.Spinbox(row1_frame, from_=1, to=ColorPaletteFrame.MAX_COLORS, width=8,
                             textvariable=self.color_count,
                             font=('Segoe UI', 10),
                             bg='#34495e', fg='#ecf0f1',
                             relief='flat', bd=2,
                             highlightbackground='#3498db',
-                            command=self.update_color_boxes,
+                            command=self._on_color_count_change,
                             justify='center')
         spinbox.pack(side='left', padx=(0, 30))
         
@@ -671,10 +950,12 @@ class ColorRecolorApp:
                                         width=12, relief='flat', bd=2,
                                         highlightcolor='#3498db',
                                         highlightbackground='#bdc3c7',
-                                        bg='#34495e', fg='#ecf0f1')
-        self.base_color_entry.insert(0, "#3498db")
+                                        bg='#34495e', fg='#ecf0f1',
+                                        textvariable=self.base_color_var)
         self.base_color_entry.pack(side='left', padx=(0, 10))
-        self.base_color_entry.bind('<KeyRelease>', self._update_base_preview)
+        
+        # Превью обновляется только при изменении текста, а не на каждую клавишу
+        self.base_color_var.trace_add('write', self._schedule_base_preview)
         
         self.base_preview = tk.Label(row1_frame, width=6, height=1,
                                      relief='ridge', borderwidth=2,
@@ -683,10 +964,8 @@ class ColorRecolorApp:
         self.base_preview.bind("<Button-1>", lambda e: self._choose_base_color())
         
         # Кнопка выбора цвета
-        tk.Button(row1_frame, text="🎨 Выбрать",
-                 font=('Segoe UI', 9),
-                 bg='#9b59b6', fg='white',
-                 command=self._choose_base_color).pack(side='left')
+        self._action_button(row1_frame, "🎨 Выбрать", '#9b59b6',
+                            self._choose_base_color).pack(side='left')
         
         # Вторая строка: интенсивность
         row2_frame = StyledFrame(inner_frame, bg='#2c3e50')
@@ -708,7 +987,7 @@ class ColorRecolorApp:
                           orient="horizontal",
                           length=200)
         slider.pack(side='right', fill='x', expand=True)
-        slider.bind('<Motion>', lambda e: self._update_intensity_label())
+        self.intensity_var.trace_add('write', self._schedule_intensity_label)
         
         # Третья строка: режимы
         row3_frame = StyledFrame(inner_frame, bg='#2c3e50')
@@ -739,10 +1018,8 @@ class ColorRecolorApp:
             rb.pack(side='left', padx=20)
         
         # Кнопка обновления
-        tk.Button(row3_frame, text="🔄 Обновить колонки",
-                 font=('Segoe UI', 9),
-                 bg='#27ae60', fg='white',
-                 command=self.update_color_boxes).pack(side='right')
+        self._action_button(row3_frame, "🔄 Обновить колонки", '#27ae60',
+                            self.update_color_boxes).pack(side='right')
     
     def _create_result_panel(self, parent):
         """Создает художественную панель результатов с увеличенной областью"""
@@ -761,25 +1038,17 @@ class ColorRecolorApp:
         buttons_frame = StyledFrame(header_frame, bg='#2c3e50')
         buttons_frame.pack(side='right', padx=15)
         
-        tk.Button(buttons_frame, text="📋 Копировать",
-                 font=('Segoe UI', 9),
-                 bg='#27ae60', fg='white',
-                 command=self._copy_all_results).pack(side='left', padx=2)
+        self._action_button(buttons_frame, "📋 Копировать", '#27ae60',
+                            self._copy_all_results).pack(side='left', padx=2)
         
-        tk.Button(buttons_frame, text="🗑️ Очистить",
-                 font=('Segoe UI', 9),
-                 bg='#e74c3c', fg='white',
-                 command=lambda: self.result_text.delete(1.0, tk.END)).pack(side='left', padx=2)
+        self._action_button(buttons_frame, "🗑️ Очистить", '#e74c3c',
+                            lambda: self.result_text.delete(1.0, tk.END)).pack(side='left', padx=2)
         
-        tk.Button(buttons_frame, text="📁 Экспорт",
-                 font=('Segoe UI', 9),
-                 bg='#3498db', fg='white',
-                 command=self._export_results).pack(side='left', padx=2)
+        self._action_button(buttons_frame, "📁 Экспорт", '#3498db',
+                            self._export_results).pack(side='left', padx=2)
         
-        tk.Button(buttons_frame, text="ℹ️ Справка",
-                 font=('Segoe UI', 9),
-                 bg='#9b59b6', fg='white',
-                 command=self._show_results_help).pack(side='left', padx=2)
+        self._action_button(buttons_frame, "ℹ️ Справка", '#9b59b6',
+                            self._show_results_help).pack(side='left', padx=2)
         
         # Текстовое поле с прокруткой (увеличено для лучшего отображения)
         text_container = StyledFrame(result_frame, bg='#2c3e50')
@@ -824,73 +1093,35 @@ class ColorRecolorApp:
         bottom_buttons = StyledFrame(result_frame, bg='#2c3e50')
         bottom_buttons.pack(fill='x', pady=10)
         
-        tk.Button(bottom_buttons, text="🔄 Загрузить пример палитры",
-                 font=('Segoe UI', 10),
-                 bg='#9b59b6', fg='white',
-                 command=self._load_example_data).pack(side='left', padx=10)
+        self._action_button(bottom_buttons, "🔄 Загрузить пример палитры", '#9b59b6',
+                            self._load_example_data, size=10).pack(side='left', padx=10)
         
-        tk.Button(bottom_buttons, text="🎨 Показать цветовую схему",
-                 font=('Segoe UI', 10),
-                 bg='#3498db', fg='white',
-                 command=self._show_color_scheme).pack(side='left', padx=10)
+        self._action_button(bottom_buttons, "🎨 Показать цветовую схему", '#3498db',
+                            self._show_color_scheme, size=10).pack(side='left', padx=10)
         
-        tk.Button(bottom_buttons, text="💾 Сохранить настройки",
-                 font=('Segoe UI', 10),
-                 bg='#27ae60', fg='white',
-                 command=self._save_settings).pack(side='left', padx=10)
+        self._action_button(bottom_buttons, "💾 Сохранить настройки", '#27ae60',
+                            self._save_settings, size=10).pack(side='left', padx=10)
+    
+    @staticmethod
+    def _action_button(parent, text: str, bg: str, command: Callable, size: int = 9) -> tk.Button:
+        """Создает кнопку действия в общем стиле приложения"""
+        return tk.Button(parent, text=text, font=('Segoe UI', size),
+                         bg=bg, fg='white', command=command)
     
     def _setup_text_tags(self):
         """Настраивает теги для форматирования текста в результатах"""
-        # Основные теги
-        self.result_text.tag_config('header', 
-                                   font=('Consolas', 12, 'bold'), 
-                                   foreground='#3498db',
-                                   spacing1=10, spacing3=5)
-        
-        self.result_text.tag_config('subheader', 
-                                   font=('Consolas', 11, 'bold'), 
-                                   foreground='#9b59b6',
-                                   spacing1=8)
-        
-        self.result_text.tag_config('bold', 
-                                   font=('Consolas', 11, 'bold'))
-        
-        self.result_text.tag_config('original', 
-                                   font=('Consolas', 11),
-                                   foreground='#e74c3c')
-        
-        self.result_text.tag_config('new', 
-                                   font=('Consolas', 11, 'bold'),
-                                   foreground='#27ae60')
-        
-        self.result_text.tag_config('arrow', 
-                                   font=('Consolas', 11),
-                                   foreground='#f1c40f')
-        
-        self.result_text.tag_config('luminance', 
-                                   font=('Consolas', 10),
-                                   foreground='#95a5a6')
-        
-        self.result_text.tag_config('summary', 
-                                   font=('Consolas', 11, 'bold'),
-                                   foreground='#f1c40f',
-                                   spacing1=10)
-        
-        self.result_text.tag_config('separator', 
-                                   font=('Consolas', 10),
-                                   foreground='#7f8c8d')
-        
-        self.result_text.tag_config('success', 
-                                   font=('Consolas', 11, 'bold'),
-                                   foreground='#27ae60',
-                                   spacing1=10)
-        
-        self.result_text.tag_config('error', 
-                                   font=('Consolas', 11, 'bold'),
-                                   foreground='#e74c3c')
+        for name, options in self.TEXT_TAGS:
+            self.result_text.tag_config(name, **options)
+    
+    def _schedule_intensity_label(self, *args):
+        """Планирует обновление метки интенсивности не чаще INTENSITY_LABEL_INTERVAL_MS"""
+        if self._intensity_label_job is None:
+            self._intensity_label_job = self.root.after(self.INTENSITY_LABEL_INTERVAL_MS,
+                                                        self._update_intensity_label)
     
     def _update_intensity_label(self):
         """Обновляет метку интенсивности"""
+        self._intensity_label_job = None
         intensity = self.intensity_var.get()
         self.intensity_label.config(text=f"{intensity:.2f}")
     
@@ -899,42 +1130,59 @@ class ColorRecolorApp:
         color_code = colorchooser.askcolor(title="Выберите базовый цвет",
                                           initialcolor=self.base_preview.cget('bg'))
         if color_code[1]:
-            self.base_color_entry.delete(0, tk.END)
-            self.base_color_entry.insert(0, color_code[1])
-            self.base_preview.config(bg=color_code[1])
+            self.base_color_var.set(color_code[1])
+            self._update_base_preview()
+    
+    def _schedule_base_preview(self, *args):
+        """Откладывает обновление превью базового цвета до паузы в наборе текста"""
+        if self._base_preview_job is not None:
+            self.root.after_cancel(self._base_preview_job)
+        self._base_preview_job = self.root.after(ColorPaletteFrame.PREVIEW_DEBOUNCE_MS,
+                                                 self._update_base_preview)
     
     def _update_base_preview(self, event=None):
         """Обновляет превью базового цвета"""
-        color = self.base_color_entry.get().strip()
-        normalized = ColorUtility.normalize_color(color)
+        # Прямой вызов отменяет отложенное обновление, оно уже не нужно
+        job, self._base_preview_job = self._base_preview_job, None
+        if job is not None:
+            self.root.after_cancel(job)
         
-        if ColorUtility.is_valid_color(normalized):
-            self.base_preview.config(bg=normalized)
-        else:
-            self.base_preview.config(bg='#ffffff')
+        color = self.base_color_entry.get().strip()
+        normalized = ColorUtility.try_normalize(color)
+        self.base_preview.config(bg=normalized or '#ffffff')
+    
+    def _on_color_count_change(self):
+        """Обновляет колонки при изменении счетчика, если количество действительно изменилось"""
+        # Стрелка на границе диапазона вызывает команду с тем же значением
+        if self.color_count.get() != self._shown_color_count:
+            self.update_color_boxes()
     
     def update_color_boxes(self):
         """Обновляет количество полей для цветов в обеих колонках"""
         count = self.color_count.get()
         self.left_panel.create_color_inputs(count)
         self.right_panel.create_color_inputs(count)
+        self._shown_color_count = count
     
     def process_colors(self):
         """Обрабатывает цвета из обеих колонок"""
         base_color = self.base_color_entry.get()
-        normalized_base = ColorUtility.normalize_color(base_color)
+        normalized_base = ColorUtility.try_normalize(base_color)
         
-        if not ColorUtility.is_valid_color(normalized_base):
+        if normalized_base is None:
             self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, "❌ Ошибка: неверный базовый цвет\n", 'error')
-            self.result_text.insert(tk.END, "Пожалуйста, введите корректный HEX-код цвета (например, #3498db)\n")
+            self.result_text.insert(
+                tk.END,
+                "❌ Ошибка: неверный базовый цвет\n", 'error',
+                "Пожалуйста, введите корректный HEX-код цвета (например, #3498db)\n", ''
+            )
             return
         
         # Анимация кнопки
         original_text = self.process_btn.cget('text')
         original_bg = self.process_btn.cget('bg')
         self.process_btn.config(text="✨ Обработка...", bg='#f39c12', state='disabled')
-        self.root.update()
+        self.root.update_idletasks()
         
         try:
             # Получаем входные данные из ОБЕИХ колонок
@@ -944,115 +1192,103 @@ class ColorRecolorApp:
             intensity = self.intensity_var.get()
             mode = RecolorMode(self.mode_var.get())
             
-            # Обрабатываем цвета из обеих колонок
-            left_results = self.recolor_service.recolor_palette(
-                left_colors, normalized_base, intensity, mode
-            )
-            
-            right_results = self.recolor_service.recolor_palette(
-                right_colors, normalized_base, intensity, mode
+            # Обрабатываем цвета из обеих колонок одним вызовом
+            left_results, right_results = self.recolor_service.recolor_palettes(
+                [left_colors, right_colors], normalized_base, intensity, mode
             )
             
             # Отображаем результаты
             self._display_results(left_results, right_results)
             
             # Обновляем превью в обеих колонках
-            left_new_colors = [r.new_color for r in left_results]
-            right_new_colors = [r.new_color for r in right_results]
-            
-            self.left_panel.update_preview_colors(left_new_colors)
-            self.right_panel.update_preview_colors(right_new_colors)
+            self.left_panel.update_preview_colors(left_results.new_colors)
+            self.right_panel.update_preview_colors(right_results.new_colors)
             
         except Exception as e:
             self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"❌ Ошибка при обработке цветов:\n", 'error')
-            self.result_text.insert(tk.END, f"{str(e)}\n")
+            self.result_text.insert(
+                tk.END,
+                "❌ Ошибка при обработке цветов:\n", 'error',
+                f"{e}\n", ''
+            )
         finally:
             # Восстанавливаем кнопку
             self.process_btn.config(text=original_text, bg=original_bg, state='normal')
     
-    def _display_results(self, left_results: List[ColorResult], 
-                        right_results: List[ColorResult]):
+    def _display_results(self, left_results: ColorResults, 
+                        right_results: ColorResults):
         """Отображает результаты обработки из обеих колонок"""
         self.result_text.delete(1.0, tk.END)
         
         if not left_results and not right_results:
-            self.result_text.insert(tk.END, "ℹ️ Нет данных для отображения\n", 'header')
-            self.result_text.insert(tk.END, "Введите цвета в левую и/или правую колонку и нажмите 'Перекрасить палитры'\n")
+            self.result_text.insert(
+                tk.END,
+                "ℹ️ Нет данных для отображения\n", 'header',
+                "Введите цвета в левую и/или правую колонку и нажмите 'Перекрасить палитры'\n", ''
+            )
             return
         
+        # Текст собирается в список пар (фрагмент, тег) и вставляется одним вызовом
+        chunks: List[str] = []
+        
         # Заголовок
-        self.result_text.insert(tk.END, "🎨 РЕЗУЛЬТАТЫ ЦВЕТОВОЙ ПЕРЕКРАСКИ\n", 'header')
-        self.result_text.insert(tk.END, "=" * 70 + "\n", 'separator')
-        self.result_text.insert(tk.END, f"Базовый цвет: {self.base_color_entry.get()}\n")
-        self.result_text.insert(tk.END, f"Интенсивность: {self.intensity_var.get():.2f}\n")
-        self.result_text.insert(tk.END, f"Режим: {self.mode_var.get().replace('_', ' ').title()}\n\n")
+        chunks += ["🎨 РЕЗУЛЬТАТЫ ЦВЕТОВОЙ ПЕРЕКРАСКИ\n", 'header']
+        chunks += ["=" * 70 + "\n", 'separator']
+        chunks += [f"Базовый цвет: {self.base_color_entry.get()}\n"
+                   f"Интенсивность: {self.intensity_var.get():.2f}\n"
+                   f"Режим: {self.mode_var.get().replace('_', ' ').title()}\n\n", '']
         
         total_processed = len(left_results) + len(right_results)
         
         # Левая колонка
         if left_results:
-            self.result_text.insert(tk.END, "☀️ ЛЕВАЯ КОЛОНКА (СВЕТЛЫЕ ЦВЕТА):\n", 'subheader')
-            self.result_text.insert(tk.END, "-" * 50 + "\n", 'separator')
-            
-            for i, result in enumerate(left_results, 1):
-                self.result_text.insert(tk.END, f"{i:2d}. ", 'bold')
-                self.result_text.insert(tk.END, f"{result.original:12s}", 'original')
-                self.result_text.insert(tk.END, "  →  ", 'arrow')
-                self.result_text.insert(tk.END, f"{result.new_color:12s}", 'new')
-                
-                # Индикатор яркости с цветовым кодом
-                lum_display = f"{result.luminance:.3f}"
-                if result.luminance > 0.7:
-                    lum_indicator = "🔆 Светлый"
-                elif result.luminance < 0.3:
-                    lum_indicator = "🔅 Тёмный"
-                else:
-                    lum_indicator = "💡 Средний"
-                
-                self.result_text.insert(tk.END, f"   {lum_indicator} (яркость: {lum_display})\n")
-            
-            self.result_text.insert(tk.END, "\n")
+            chunks += self._result_column("☀️ ЛЕВАЯ КОЛОНКА (СВЕТЛЫЕ ЦВЕТА)", left_results)
+            chunks += ["\n", '']
         
         # Правая колонка
         if right_results:
-            self.result_text.insert(tk.END, "🌙 ПРАВАЯ КОЛОНКА (ТЕМНЫЕ ЦВЕТА):\n", 'subheader')
-            self.result_text.insert(tk.END, "-" * 50 + "\n", 'separator')
-            
-            for i, result in enumerate(right_results, 1):
-                self.result_text.insert(tk.END, f"{i:2d}. ", 'bold')
-                self.result_text.insert(tk.END, f"{result.original:12s}", 'original')
-                self.result_text.insert(tk.END, "  →  ", 'arrow')
-                self.result_text.insert(tk.END, f"{result.new_color:12s}", 'new')
-                
-                # Индикатор яркости с цветовым кодом
-                lum_display = f"{result.luminance:.3f}"
-                if result.luminance > 0.7:
-                    lum_indicator = "🔆 Светлый"
-                elif result.luminance < 0.3:
-                    lum_indicator = "🔅 Тёмный"
-                else:
-                    lum_indicator = "💡 Средний"
-                
-                self.result_text.insert(tk.END, f"   {lum_indicator} (яркость: {lum_display})\n")
+            chunks += self._result_column("🌙 ПРАВАЯ КОЛОНКА (ТЕМНЫЕ ЦВЕТА)", right_results)
         
         # Сводка
         total_left = len(left_results)
         total_right = len(right_results)
         
-        self.result_text.insert(tk.END, "\n" + "=" * 70 + "\n", 'separator')
-        self.result_text.insert(tk.END, "📊 СВОДКА РЕЗУЛЬТАТОВ:\n", 'summary')
-        self.result_text.insert(tk.END, f"• Всего обработано цветов: {total_processed}\n")
-        self.result_text.insert(tk.END, f"• Левая колонка: {total_left} цветов\n")
-        self.result_text.insert(tk.END, f"• Правая колонка: {total_right} цветов\n")
+        chunks += ["\n" + "=" * 70 + "\n", 'separator']
+        chunks += ["📊 СВОДКА РЕЗУЛЬТАТОВ:\n", 'summary']
+        chunks += [f"• Всего обработано цветов: {total_processed}\n"
+                   f"• Левая колонка: {total_left} цветов\n"
+                   f"• Правая колонка: {total_right} цветов\n", '']
         
         # Подсказка
-        self.result_text.insert(tk.END, "\n💡 Новые цвета отображены в превью соответствующих колонок\n", 'success')
-        self.result_text.insert(tk.END, "💡 Используйте правую кнопку мыши для копирования текста\n")
+        chunks += ["\n💡 Новые цвета отображены в превью соответствующих колонок\n", 'success']
+        chunks += ["💡 Используйте правую кнопку мыши для копирования текста\n", '']
+        
+        self.result_text.insert(tk.END, *chunks)
         
         # Прокручиваем к началу
         self.result_text.see(1.0)
     
+    @classmethod
+    def _result_column(cls, title: str, results: ColorResults) -> List[str]:
+        """Формирует заголовок и строки результатов колонки в виде пар (фрагмент, тег)"""
+        luminances = results.luminances
+        
+        # Индикаторы яркости выбираются из таблицы сразу для всей колонки
+        label_indices = ((luminances >= 0.3).astype(int) + (luminances > 0.7)).tolist()
+        labels = cls.LUMINANCE_LABELS
+        
+        chunks: List[str] = [f"{title}:\n", 'subheader', "-" * 50 + "\n", 'separator']
+        rows = zip(results.originals, results.new_colors, luminances.tolist(), label_indices)
+        for i, (original, new_color, luminance, label_idx) in enumerate(rows, 1):
+            chunks += [
+                f"{i:2d}. ", 'bold',
+                f"{original:12s}", 'original',
+                "  →  ", 'arrow',
+                f"{new_color:12s}", 'new',
+                f"   {labels[label_idx]} (яркость: {luminance:.3f})\n", '',
+            ]
+        return chunks
+    
     def _copy_all_results(self):
         """Копирует все результаты в буфер обмена"""
         content = self.result_text.get(1.0, tk.END).strip()
@@ -1182,7 +1418,7 @@ class ColorRecolorApp:
             "#6C5CE7", "#FDCB6E", "#636E72", "#2D3436"
         ]
         
-        count = min(self.color_count.get(), 8)
+        count = max(0, min(self.color_count.get(), 8))
         
         # Устанавливаем цвета в левую колонку
         left_colors_to_set = left_example_colors[:count]
@@ -1193,17 +1429,19 @@ class ColorRecolorApp:
         self.right_panel.set_colors(right_colors_to_set)
         
         # Устанавливаем интересный базовый цвет
-        self.base_color_entry.delete(0, tk.END)
-        self.base_color_entry.insert(0, "#9b59b6")
+        self.base_color_var.set("#9b59b6")
         self._update_base_preview()
         
         # Показываем сообщение
         self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, "✅ Пример палитры загружен!\n\n", 'success')
-        self.result_text.insert(tk.END, f"• Левая колонка: {count} светлых цветов\n")
-        self.result_text.insert(tk.END, f"• Правая колонка: {count} темных цветов\n")
-        self.result_text.insert(tk.END, f"• Базовый цвет: #9b59b6 (фиолетовый)\n\n")
-        self.result_text.insert(tk.END, "Нажмите '🎯 ПЕРЕКРАСИТЬ ПАЛИТРЫ' для обработки\n")
+        self.result_text.insert(
+            tk.END,
+            "✅ Пример палитры загружен!\n\n", 'success',
+            f"• Левая колонка: {count} светлых цветов\n"
+            f"• Правая колонка: {count} темных цветов\n"
+            "• Базовый цвет: #9b59b6 (фиолетовый)\n\n"
+            "Нажмите '🎯 ПЕРЕКРАСИТЬ ПАЛИТРЫ' для обработки\n", ''
+        )
 
 
 # ============================================================================